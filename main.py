@@ -1,8 +1,10 @@
 import hydra
-import mlflow
+from hydra.core.hydra_config import HydraConfig
 import os
 from omegaconf import DictConfig, OmegaConf
 
+from src.pipeline import ensure_serial_etl, run_etl_steps, shared_etl_steps
+
 _steps = [
     "get_data",
     "clean_data",
@@ -15,6 +17,14 @@ _steps = [
 #    "test_regression_model"
 ]
 
+
+def resolve_active_steps(config: DictConfig, shared_steps: list[str]) -> list[str]:
+    """Returns the steps this run should execute, leaving out any ETL steps already shared by the sweep."""
+    steps_or = config['main']['steps']
+    active_steps = steps_or.split(",") if steps_or != "all" else list(_steps)
+    return [step for step in active_steps if step not in shared_steps]
+
+
 # read in the hydra configuration
 @hydra.main(config_name='config', version_base=None, config_path=".")
 def go(config: DictConfig):
@@ -25,38 +35,13 @@ def go(config: DictConfig):
     # get the path at root of MLFlow project
     root_path = hydra.utils.get_original_cwd()
 
-    # Determine which steps to execute
-    steps_or = config['main']['steps']
-    active_steps = steps_or.split(",") if steps_or != "all" else ''
+    # Determine which steps to execute, skipping any the SharedEtlCallback already ran for the whole sweep
+    hydra_config = HydraConfig.get()
+    active_steps = resolve_active_steps(config, shared_etl_steps(hydra_config))
+    ensure_serial_etl(hydra_config, active_steps)
 
     # run each step in turn
-    if "get_data" in active_steps:
-        # grab all data and load up to W&B
-        _ = mlflow.run(
-            uri=".",
-            entry_point="get_data",
-            parameters={
-                "series_config_path": config["etl"]["series_config_path"],
-                "api_base_url": config["etl"]["api_base_url"],
-                "fred_api_key": config["etl"]["fred_api_key"],
-                "output_path": config["etl"]["output_path"],
-                "artifact_name": config["etl"]["artifact_name"],
-                "artifact_type": "dataset"
-            }
-        )
-    
-    if "clean_data" in active_steps:
-        # clean data, returning new artifact to W&B
-        _ = mlflow.run(
-            uri=".",
-            entry_point="clean_data",
-            parameters={
-                "input_artifact": config["cleaning"]["input_artifact"],
-                "output_path": config["cleaning"]["output_path"],
-                "artifact_name": config["cleaning"]["artifact_name"],
-                "artifact_type": "dataset"
-            }
-        )
+    run_etl_steps(config, active_steps)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,382 @@
+"""The pipeline module runs the shared ETL steps of the MLflow project, and lets Hydra sweeps share them.
+
+A Hydra multirun (`python main.py -m ...`) launches every sweep member through the joblib launcher, so members execute in parallel worker processes. When `main.shared_etl` is enabled and no sweep override touches the ETL inputs, the SharedEtlCallback runs get_data and clean_data exactly once in the parent process before the members are launched, then leaves a marker file in the sweep directory. Members that find the marker skip those steps and read the same read-only copy of the clean data, leaving only the divergent downstream steps to run per member. Members that would run ETL steps of their own refuse to do so in parallel, since they all write to the same cache files and W&B artifacts.
+
+When the sweep finishes, the callback compares the sweep wall-clock time against an estimated serial baseline, i.e. roughly the time it would have taken to run every member one after another, with each member refetching and recleaning the data itself.
+"""
+
+# Imports
+# Standard Library Modules
+import json
+import os
+from pathlib import Path
+import shutil
+import stat
+import time
+from typing import Any
+
+# Pip Modules
+from hydra.core.override_parser.overrides_parser import OverridesParser
+from hydra.core.utils import JobReturn, JobStatus
+from hydra.experimental.callback import Callback
+from hydra.types import RunMode
+import mlflow
+from omegaconf import DictConfig, OmegaConf
+
+# Custom Modules
+from src.utilities import new_logger
+
+
+# Start the logging object
+logger = new_logger("pipeline", 'logs/pipeline')
+
+# The steps that make up the ETL prefix, in the order they must run
+ETL_STEPS = [
+    "get_data",
+    "clean_data"
+]
+
+# Config keys that change what the ETL prefix produces, or whether it is shared at all
+ETL_CONFIG_KEYS = (
+    "etl",
+    "cleaning",
+    "main.steps",
+    "main.project_name",
+    "main.shared_etl"
+)
+
+# The marker written to the sweep directory with the shared ETL steps, or the error that stopped them
+SHARED_ETL_MARKER = ".shared_etl.json"
+# The read-only copy of the clean data that every sweep member reads, prefixed to the cleaning.artifact_name
+SHARED_DATA_PREFIX = "shared."
+# The directory, inside the sweep directory, where each member writes its own timing file
+JOB_TIMINGS_DIR = ".job_timings"
+# The sweep timing report, written to the sweep directory
+SWEEP_TIMING_FILE = "sweep_timing.json"
+
+
+def active_etl_steps(config: DictConfig) -> list[str]:
+    """Returns the ETL steps requested by `main.steps`, in pipeline order.
+
+    Args:
+        config (DictConfig):
+            The Hydra configuration for the run, as loaded from config.yaml.
+
+    Returns:
+        list[str]: The requested subset of ETL_STEPS, or all of ETL_STEPS when `main.steps` is 'all'.
+    """
+
+    steps_or = config["main"]["steps"]
+    if steps_or == "all":
+        return list(ETL_STEPS)
+    requested = steps_or.split(",")
+    return [step for step in ETL_STEPS if step in requested]
+
+
+def etl_sweep_overrides(config: DictConfig) -> list[str]:
+    """Finds the sweep overrides that would give sweep members different ETL inputs.
+
+    Hydra leaves sweep overrides out of the config it hands to the multirun hooks, so they are read back from `hydra.overrides.task` instead, along with any sweeps declared in config under `hydra.sweeper.params`.
+
+    Args:
+        config (DictConfig):
+            The full Hydra configuration for the multirun, including the `hydra` node.
+
+    Returns:
+        list[str]: The original override strings that sweep over any of ETL_CONFIG_KEYS.
+    """
+
+    task_overrides = list(config.hydra.overrides.task)
+    # sweeps declared in config are written as `key: values`, so turn them back into override strings
+    sweeper_params = OmegaConf.select(config, "hydra.sweeper.params") or {}
+    task_overrides += [f"{key}={value}" for key, value in sweeper_params.items()]
+    parsed = OverridesParser.create().parse_overrides(overrides=task_overrides)
+
+    swept = []
+    for raw, override in zip(task_overrides, parsed):
+        key = override.key_or_group
+        if override.is_sweep_override() and any(key == etl_key or key.startswith(f"{etl_key}.") for etl_key in ETL_CONFIG_KEYS):
+            swept.append(raw)
+    return swept
+
+
+def _read_shared_etl_marker(hydra_config: DictConfig) -> dict:
+    """Reads the marker left in the sweep directory by the SharedEtlCallback.
+
+    Hydra turns exceptions raised by callbacks into warnings and launches the members anyway, so when the callback refused the sweep or the shared prefix failed, the marker carries the error and every member raises it instead.
+
+    Args:
+        hydra_config (DictConfig):
+            The `hydra` node of the job configuration, e.g. from HydraConfig.get().
+
+    Returns:
+        dict: The marker contents, or an empty dictionary outside of a multirun or when no marker exists.
+
+    Raises:
+        RuntimeError: Raised if the SharedEtlCallback recorded an error instead of running the shared prefix.
+    """
+
+    if hydra_config.mode != RunMode.MULTIRUN:
+        return {}
+
+    marker_path = Path(hydra_config.sweep.dir) / SHARED_ETL_MARKER
+    if not marker_path.exists():
+        return {}
+
+    marker = json.loads(marker_path.read_text())
+    if "error" in marker:
+        raise RuntimeError(f"The shared ETL prefix did not run, so this sweep member cannot either. {marker['error']}")
+    return marker
+
+
+def shared_etl_steps(hydra_config: DictConfig) -> list[str]:
+    """Returns the ETL steps that the SharedEtlCallback already ran once for the whole sweep.
+
+    Members rely on the marker file rather than on `main.shared_etl`, so they only skip steps that were actually run.
+
+    Args:
+        hydra_config (DictConfig):
+            The `hydra` node of the job configuration, e.g. from HydraConfig.get().
+
+    Returns:
+        list[str]: The shared ETL steps, or an empty list outside of a multirun or when no marker exists.
+
+    Raises:
+        RuntimeError: Raised if the SharedEtlCallback recorded an error instead of running the shared prefix.
+    """
+
+    return _read_shared_etl_marker(hydra_config).get("steps", [])
+
+
+def shared_clean_data_path(hydra_config: DictConfig) -> Path | None:
+    """Returns the read-only copy of the clean data that the shared ETL prefix produced for this sweep.
+
+    Downstream steps of a sweep member should read this file rather than `cleaning.artifact_name:latest`, which another run could republish while the sweep is still going.
+
+    Args:
+        hydra_config (DictConfig):
+            The `hydra` node of the job configuration, e.g. from HydraConfig.get().
+
+    Returns:
+        Path: The shared clean data file, or None if clean_data was not shared across the sweep.
+
+    Raises:
+        RuntimeError: Raised if the SharedEtlCallback recorded an error instead of running the shared prefix.
+    """
+
+    clean_data_path = _read_shared_etl_marker(hydra_config).get("clean_data_path")
+    return Path(clean_data_path) if clean_data_path is not None else None
+
+
+def ensure_serial_etl(hydra_config: DictConfig, active_steps: list[str]) -> None:
+    """Stops parallel sweep members from running ETL steps of their own.
+
+    Every member's get_data and clean_data write to the same cache files and W&B artifacts, so they are only safe to run one member at a time.
+
+    Args:
+        hydra_config (DictConfig):
+            The `hydra` node of the job configuration, e.g. from HydraConfig.get().
+        active_steps (list[str]):
+            The steps this sweep member is about to run.
+
+    Raises:
+        ValueError: Raised if this member would run ETL steps while other members run in parallel.
+    """
+
+    if hydra_config.mode != RunMode.MULTIRUN or hydra_config.launcher.get("n_jobs", 1) == 1:
+        return
+
+    member_etl_steps = [step for step in ETL_STEPS if step in active_steps]
+    if len(member_etl_steps) > 0:
+        raise ValueError(
+            f"This sweep member would run {member_etl_steps} itself while other members run in parallel, and they "
+            "would all write to the same cache files and W&B artifacts. Let the sweep share one ETL prefix "
+            "(main.shared_etl=true), or add hydra.launcher.n_jobs=1 so the members run one after another."
+        )
+
+
+def run_etl_steps(config: DictConfig, active_steps: list[str]) -> None:
+    """Runs each requested ETL step as its own MLflow entry point, in pipeline order.
+
+    Args:
+        config (DictConfig):
+            The Hydra configuration for the run, as loaded from config.yaml.
+        active_steps (list[str]):
+            The names of the steps to execute. Steps that are not ETL steps are ignored.
+    """
+
+    if "get_data" in active_steps:
+        # grab all data and load up to W&B
+        logger.info("Running the get_data step...")
+        _ = mlflow.run(
+            uri=".",
+            entry_point="get_data",
+            parameters={
+                "series_config_path": config["etl"]["series_config_path"],
+                "api_base_url": config["etl"]["api_base_url"],
+                "fred_api_key": config["etl"]["fred_api_key"],
+                "output_path": config["etl"]["output_path"],
+                "artifact_name": config["etl"]["artifact_name"],
+                "artifact_type": "dataset"
+            }
+        )
+
+    if "clean_data" in active_steps:
+        # clean data, returning new artifact to W&B
+        logger.info("Running the clean_data step...")
+        _ = mlflow.run(
+            uri=".",
+            entry_point="clean_data",
+            parameters={
+                "input_artifact": config["cleaning"]["input_artifact"],
+                "output_path": config["cleaning"]["output_path"],
+                "artifact_name": config["cleaning"]["artifact_name"],
+                "artifact_type": "dataset"
+            }
+        )
+
+
+def summarize_sweep_timings(prefix_seconds: float, member_seconds: list[float], wall_seconds: float, failed_members: int = 0) -> dict:
+    """Builds the sweep timing report from the measured step durations.
+
+    The serial baseline is an estimate, not a measured serial run: it assumes every member would have run the ETL prefix itself, one member after another. Member times are measured while members compete for CPU, so the estimate, and the speedup derived from it, lean high.
+
+    Args:
+        prefix_seconds (float):
+            How long the shared ETL prefix took to run, in seconds.
+        member_seconds (list[float]):
+            How long each sweep member took to run, in seconds.
+        wall_seconds (float):
+            The total wall-clock time of the sweep, including the shared ETL prefix, in seconds.
+        failed_members (int):
+            The number of sweep members that did not complete. They are left out of the serial baseline, and the speedup is None if no member completed. Defaults to 0.
+
+    Returns:
+        dict: The timing report, including the estimated serial baseline and the estimated speedup over it.
+    """
+
+    serial_seconds = len(member_seconds) * prefix_seconds + sum(member_seconds)
+    completed = len(member_seconds) > 0 and wall_seconds > 0
+
+    return {
+        "members": len(member_seconds),
+        "failed_members": failed_members,
+        "etl_prefix_seconds": prefix_seconds,
+        "member_seconds": member_seconds,
+        "sweep_wall_seconds": wall_seconds,
+        "estimated_serial_seconds": serial_seconds,
+        "estimated_speedup": serial_seconds / wall_seconds if completed else None
+    }
+
+
+class SharedEtlCallback(Callback):
+    """Hydra callback that runs the ETL prefix once per sweep and reports the sweep timings.
+
+    Registered under `hydra.callbacks` in config.yaml. The multirun hooks run in the parent process, while the job hooks run inside each sweep member's worker process, so the shared steps and member timings are handed over through small JSON files in the sweep directory.
+    """
+
+    def __init__(self) -> None:
+        self._sweep_start = None
+        self._prefix_seconds = 0.0
+        self._job_start = None
+
+    def on_multirun_start(self, config: DictConfig, **kwargs: Any) -> None:
+        self._sweep_start = time.perf_counter()
+        self._prefix_seconds = 0.0
+
+        # clear out anything left behind by an earlier sweep that used the same directory
+        sweep_dir = Path(config.hydra.sweep.dir)
+        sweep_dir.mkdir(parents=True, exist_ok=True)
+        (sweep_dir / SHARED_ETL_MARKER).unlink(missing_ok=True)
+        shared_data_path = sweep_dir / f"{SHARED_DATA_PREFIX}{config['cleaning']['artifact_name']}"
+        if shared_data_path.exists():
+            # the shared copy is read-only, which would stop it being removed on Windows
+            shared_data_path.chmod(stat.S_IREAD | stat.S_IWRITE)
+            shared_data_path.unlink()
+        shutil.rmtree(sweep_dir / JOB_TIMINGS_DIR, ignore_errors=True)
+        (sweep_dir / JOB_TIMINGS_DIR).mkdir()
+
+        if not config["main"].get("shared_etl", False):
+            logger.info("main.shared_etl is disabled, each sweep member will run its own ETL steps.")
+            return
+
+        etl_steps = active_etl_steps(config)
+        try:
+            swept = etl_sweep_overrides(config)
+            if len(swept) > 0:
+                raise ValueError(
+                    f"The sweep overrides {swept} change the ETL inputs, so the sweep members cannot share one ETL prefix. "
+                    "Sweep them with main.shared_etl=false hydra.launcher.n_jobs=1 instead."
+                )
+
+            if len(etl_steps) == 0:
+                logger.info("No ETL steps requested, nothing to share across the sweep.")
+                return
+
+            # set up WANDB project and experiment variables, as main.go would for a single run
+            os.environ["WANDB_PROJECT"] = config["main"]["project_name"]
+            os.environ["WANDB_RUN_GROUP"] = config["main"]["experiment_name"]
+
+            logger.info(f"Running the shared ETL prefix ({','.join(etl_steps)}) once for the whole sweep...")
+            run_etl_steps(config, etl_steps)
+
+            marker = {"steps": etl_steps}
+            if "clean_data" in etl_steps:
+                # pin the clean data for the whole sweep, so a later clean_data run elsewhere cannot change what members read
+                clean_path = Path(config["cleaning"]["output_path"]) / config["cleaning"]["artifact_name"]
+                shutil.copyfile(clean_path, shared_data_path)
+                shared_data_path.chmod(stat.S_IREAD)
+                marker["clean_data_path"] = str(shared_data_path.resolve())
+                logger.info(f"Pinned the clean data for this sweep at {shared_data_path}")
+        except Exception as err:
+            # Hydra only warns about callback errors and launches the members anyway, so leave the error for them to raise
+            (sweep_dir / SHARED_ETL_MARKER).write_text(json.dumps({"error": f"{type(err).__name__}: {err}"}))
+            raise
+
+        self._prefix_seconds = time.perf_counter() - self._sweep_start
+
+        # only publish the shared steps once every one of them has succeeded
+        (sweep_dir / SHARED_ETL_MARKER).write_text(json.dumps(marker))
+        logger.info(f"Shared ETL prefix finished in {self._prefix_seconds:.1f}s, launching sweep members.")
+
+    def on_job_start(self, config: DictConfig, **kwargs: Any) -> None:
+        self._job_start = time.perf_counter()
+
+    def on_job_end(self, config: DictConfig, job_return: JobReturn, **kwargs: Any) -> None:
+        if config.hydra.mode != RunMode.MULTIRUN or self._job_start is None:
+            return
+
+        elapsed = time.perf_counter() - self._job_start
+        timing_path = Path(config.hydra.sweep.dir) / JOB_TIMINGS_DIR / f"{config.hydra.job.num}.json"
+        timing_path.parent.mkdir(parents=True, exist_ok=True)
+        status = job_return.status.name if job_return is not None else JobStatus.UNKNOWN.name
+        timing_path.write_text(json.dumps({"job_num": config.hydra.job.num, "seconds": elapsed, "status": status}))
+        logger.debug(f"Sweep member {config.hydra.job.num} finished in {elapsed:.1f}s ({status})")
+
+    def on_multirun_end(self, config: DictConfig, **kwargs: Any) -> None:
+        if self._sweep_start is None:
+            return
+
+        wall_seconds = time.perf_counter() - self._sweep_start
+        sweep_dir = Path(config.hydra.sweep.dir)
+
+        # the timings directory was emptied in on_multirun_start, so it only holds this sweep's members
+        member_seconds = []
+        failed_members = 0
+        for timing_path in sorted((sweep_dir / JOB_TIMINGS_DIR).glob("*.json"), key=lambda path: int(path.stem)):
+            job_timing = json.loads(timing_path.read_text())
+            if job_timing["status"] == JobStatus.COMPLETED.name:
+                member_seconds.append(job_timing["seconds"])
+            else:
+                failed_members += 1
+
+        report = summarize_sweep_timings(self._prefix_seconds, member_seconds, wall_seconds, failed_members)
+        (sweep_dir / SWEEP_TIMING_FILE).write_text(json.dumps(report, indent=2))
+
+        if failed_members > 0:
+            logger.warning(f"{failed_members} sweep members failed and are left out of the sweep timings.")
+        logger.info(
+            f"Sweep of {report['members']} completed members took {wall_seconds:.1f}s "
+            f"against an estimated serial baseline of {report['estimated_serial_seconds']:.1f}s. "
+            f"Report saved to {sweep_dir / SWEEP_TIMING_FILE}"
+        )
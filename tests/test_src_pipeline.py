@@ -0,0 +1,275 @@
+"""PyTest Unit Testing for the src.pipeline module."""
+
+# PyTest
+import pytest
+# Python Standard Library Modules
+import json
+import os
+import stat
+# Third-Party Modules
+from hydra.core.utils import JobReturn, JobStatus
+from hydra.types import RunMode
+from omegaconf import OmegaConf
+
+# imports
+from ..main import resolve_active_steps
+from ..src import pipeline
+from ..src.pipeline import (
+    JOB_TIMINGS_DIR,
+    SHARED_ETL_MARKER,
+    SWEEP_TIMING_FILE,
+    SharedEtlCallback,
+    active_etl_steps,
+    ensure_serial_etl,
+    etl_sweep_overrides,
+    shared_clean_data_path,
+    shared_etl_steps,
+    summarize_sweep_timings
+)
+
+# mock up external dependencies
+def _sweep_config(sweep_dir, task=(), steps="all", shared_etl=True, n_jobs=-1, job_num=0, sweeper_params=None):
+    return OmegaConf.create({
+        "main": {"project_name": "wgu_capstone", "experiment_name": "testing", "steps": steps, "shared_etl": shared_etl},
+        "etl": {
+            "api_base_url": "https://example.com",
+            "fred_api_key": "testkey",
+            "series_config_path": "src/get_data/fred_series.json",
+            "output_path": "data/wip",
+            "artifact_name": "econ_feats.wip.parquet"
+        },
+        "cleaning": {
+            "input_artifact": "wgu_capstone/econ_feats.wip.parquet:latest",
+            "output_path": str(sweep_dir / "data" / "clean"),
+            "artifact_name": "econ_feats.clean.parquet"
+        },
+        "hydra": {
+            "mode": RunMode.MULTIRUN,
+            "sweep": {"dir": str(sweep_dir)},
+            "overrides": {"task": list(task)},
+            "sweeper": {"params": sweeper_params},
+            "launcher": {"n_jobs": n_jobs},
+            "job": {"num": job_num}
+        }
+    })
+
+@pytest.fixture
+def mlflow_calls(monkeypatch):
+    calls = []
+    def fake_run(**kwargs):
+        calls.append(kwargs["entry_point"])
+        if kwargs["entry_point"] == "clean_data":
+            # the clean_data step leaves its output in cleaning.output_path
+            clean_dir = kwargs["parameters"]["output_path"]
+            os.makedirs(clean_dir, exist_ok=True)
+            with open(f"{clean_dir}/{kwargs['parameters']['artifact_name']}", "w") as clean_fp:
+                clean_fp.write(f"clean data #{calls.count('clean_data')}")
+    monkeypatch.setattr(pipeline.mlflow, "run", fake_run)
+    # on_multirun_start sets the W&B variables, make sure they are restored afterwards
+    monkeypatch.setenv("WANDB_PROJECT", "")
+    monkeypatch.setenv("WANDB_RUN_GROUP", "")
+    return calls
+
+
+# Unit Tests: src.pipeline.active_etl_steps
+def test_active_etl_steps_all():
+    config = OmegaConf.create({"main": {"steps": "all"}})
+
+    assert active_etl_steps(config) == ["get_data", "clean_data"]
+
+def test_active_etl_steps_keeps_pipeline_order():
+    config = OmegaConf.create({"main": {"steps": "train_random_forest,clean_data,get_data"}})
+
+    assert active_etl_steps(config) == ["get_data", "clean_data"]  # downstream steps are dropped, ETL order is kept
+
+# Unit Tests: src.pipeline.etl_sweep_overrides
+def test_etl_sweep_overrides_finds_etl_sweeps(tmp_path):
+    config = _sweep_config(tmp_path, task=["etl.fred_api_key=k1,k2", "cleaning.output_path=a", "main.steps=get_data,clean_data"])
+
+    # cleaning.output_path is a single value, so every member still sees the same ETL inputs
+    assert etl_sweep_overrides(config) == ["etl.fred_api_key=k1,k2", "main.steps=get_data,clean_data"]
+
+def test_etl_sweep_overrides_finds_sweeper_params(tmp_path):
+    config = _sweep_config(tmp_path, sweeper_params={"etl.output_path": "a,b", "main.experiment_name": "x,y"})
+
+    assert etl_sweep_overrides(config) == ["etl.output_path=a,b"]
+
+def test_etl_sweep_overrides_ignores_other_sweeps(tmp_path):
+    config = _sweep_config(tmp_path, task=["main.experiment_name=a,b", "+model.max_depth=range(1,4)"])
+
+    assert etl_sweep_overrides(config) == []
+
+# Unit Tests: src.pipeline.shared_etl_steps
+def test_shared_etl_steps_reads_marker(tmp_path):
+    (tmp_path / SHARED_ETL_MARKER).write_text(json.dumps({"steps": ["get_data"]}))
+    hydra_config = _sweep_config(tmp_path).hydra
+
+    assert shared_etl_steps(hydra_config) == ["get_data"]
+
+def test_shared_etl_steps_without_marker(tmp_path):
+    hydra_config = _sweep_config(tmp_path).hydra
+
+    assert shared_etl_steps(hydra_config) == []
+
+def test_shared_etl_steps_raises_recorded_error(tmp_path):
+    (tmp_path / SHARED_ETL_MARKER).write_text(json.dumps({"error": "ValueError: sweep refused"}))
+    hydra_config = _sweep_config(tmp_path).hydra
+
+    with pytest.raises(RuntimeError, match="sweep refused"):
+        shared_etl_steps(hydra_config)
+
+def test_shared_etl_steps_outside_multirun(tmp_path):
+    (tmp_path / SHARED_ETL_MARKER).write_text(json.dumps({"steps": ["get_data", "clean_data"]}))
+    hydra_config = _sweep_config(tmp_path).hydra
+    hydra_config.mode = RunMode.RUN
+
+    assert shared_etl_steps(hydra_config) == []
+
+# Unit Tests: src.pipeline.ensure_serial_etl
+def test_ensure_serial_etl_rejects_parallel_etl(tmp_path):
+    hydra_config = _sweep_config(tmp_path, n_jobs=-1).hydra
+
+    with pytest.raises(ValueError, match="n_jobs=1"):
+        ensure_serial_etl(hydra_config, ["get_data", "clean_data", "check_data"])
+
+def test_ensure_serial_etl_allows_serial_etl(tmp_path):
+    hydra_config = _sweep_config(tmp_path, n_jobs=1).hydra
+
+    ensure_serial_etl(hydra_config, ["get_data", "clean_data"])
+
+def test_ensure_serial_etl_allows_parallel_downstream_steps(tmp_path):
+    hydra_config = _sweep_config(tmp_path, n_jobs=-1).hydra
+
+    ensure_serial_etl(hydra_config, ["check_data", "split_data"])
+
+# Unit Tests: main.resolve_active_steps
+def test_resolve_active_steps_skips_shared_steps():
+    config = OmegaConf.create({"main": {"steps": "all"}})
+
+    assert resolve_active_steps(config, ["get_data", "clean_data"]) == ["check_data", "split_data", "train_random_forest"]
+
+def test_resolve_active_steps_without_shared_steps():
+    config = OmegaConf.create({"main": {"steps": "get_data,clean_data"}})
+
+    assert resolve_active_steps(config, []) == ["get_data", "clean_data"]
+
+# Unit Tests: src.pipeline.SharedEtlCallback
+def test_callback_runs_prefix_once_and_writes_marker(tmp_path, mlflow_calls):
+    config = _sweep_config(tmp_path)
+
+    SharedEtlCallback().on_multirun_start(config)
+
+    assert mlflow_calls == ["get_data", "clean_data"]
+    assert shared_etl_steps(config.hydra) == ["get_data", "clean_data"]
+
+def test_callback_pins_read_only_clean_data(tmp_path, mlflow_calls):
+    config = _sweep_config(tmp_path)
+
+    SharedEtlCallback().on_multirun_start(config)
+    # another clean_data run republishes the clean data while the sweep is still going
+    pipeline.mlflow.run(entry_point="clean_data", parameters=dict(config["cleaning"]))
+
+    clean_data_path = shared_clean_data_path(config.hydra)
+    assert clean_data_path.parent == tmp_path
+    assert clean_data_path.read_text() == "clean data #1"
+    assert not clean_data_path.stat().st_mode & stat.S_IWUSR  # members can only read the pinned copy
+
+def test_callback_rejects_sweeper_params_etl_sweep(tmp_path, mlflow_calls):
+    config = _sweep_config(tmp_path, sweeper_params={"etl.output_path": "a,b"})
+
+    with pytest.raises(ValueError, match="etl.output_path"):
+        SharedEtlCallback().on_multirun_start(config)
+
+    assert mlflow_calls == []
+    with pytest.raises(RuntimeError, match="etl.output_path"):
+        shared_etl_steps(config.hydra)
+
+def test_callback_rejects_etl_sweep(tmp_path, mlflow_calls):
+    config = _sweep_config(tmp_path, task=["etl.fred_api_key=k1,k2"])
+
+    with pytest.raises(ValueError, match="etl.fred_api_key"):
+        SharedEtlCallback().on_multirun_start(config)
+
+    assert mlflow_calls == []
+    # Hydra only warns about callback errors, so the members must find the error and raise it themselves
+    with pytest.raises(RuntimeError, match="etl.fred_api_key"):
+        shared_etl_steps(config.hydra)
+
+def test_callback_records_prefix_failure(tmp_path, monkeypatch):
+    def failing_run(**kwargs):
+        if kwargs["entry_point"] == "clean_data":
+            raise RuntimeError("clean_data failed")
+    monkeypatch.setattr(pipeline.mlflow, "run", failing_run)
+    monkeypatch.setenv("WANDB_PROJECT", "")
+    monkeypatch.setenv("WANDB_RUN_GROUP", "")
+    config = _sweep_config(tmp_path)
+
+    with pytest.raises(RuntimeError):
+        SharedEtlCallback().on_multirun_start(config)
+
+    with pytest.raises(RuntimeError, match="clean_data failed"):
+        shared_etl_steps(config.hydra)
+
+def test_callback_clears_stale_marker(tmp_path, mlflow_calls):
+    (tmp_path / SHARED_ETL_MARKER).write_text(json.dumps({"steps": ["get_data", "clean_data"]}))
+    config = _sweep_config(tmp_path, shared_etl=False, n_jobs=1)
+
+    SharedEtlCallback().on_multirun_start(config)
+
+    assert mlflow_calls == []
+    assert shared_etl_steps(config.hydra) == []
+
+def test_callback_reports_only_this_sweeps_members(tmp_path, mlflow_calls):
+    # a timing file left behind by an earlier sweep in the same directory
+    (tmp_path / JOB_TIMINGS_DIR).mkdir()
+    (tmp_path / JOB_TIMINGS_DIR / "7.json").write_text(json.dumps({"job_num": 7, "seconds": 100.0}))
+
+    callback = SharedEtlCallback()
+    callback.on_multirun_start(_sweep_config(tmp_path))
+    for job_num in range(2):
+        job_config = _sweep_config(tmp_path, job_num=job_num)
+        callback.on_job_start(job_config)
+        callback.on_job_end(job_config, job_return=JobReturn(status=JobStatus.COMPLETED))
+    callback.on_multirun_end(_sweep_config(tmp_path))
+
+    assert sorted(path.name for path in (tmp_path / JOB_TIMINGS_DIR).iterdir()) == ["0.json", "1.json"]
+    report = json.loads((tmp_path / SWEEP_TIMING_FILE).read_text())
+    assert report["members"] == 2
+    assert report["estimated_serial_seconds"] >= report["etl_prefix_seconds"] * 2
+
+def test_callback_leaves_failed_members_out_of_timings(tmp_path, mlflow_calls):
+    callback = SharedEtlCallback()
+    callback.on_multirun_start(_sweep_config(tmp_path))
+    for job_num, status in enumerate([JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.FAILED]):
+        job_config = _sweep_config(tmp_path, job_num=job_num)
+        callback.on_job_start(job_config)
+        callback.on_job_end(job_config, job_return=JobReturn(status=status))
+    callback.on_multirun_end(_sweep_config(tmp_path))
+
+    report = json.loads((tmp_path / SWEEP_TIMING_FILE).read_text())
+    assert report["members"] == 1
+    assert report["failed_members"] == 2
+    # only the completed member is charged an ETL prefix in the serial baseline
+    assert report["estimated_serial_seconds"] == pytest.approx(report["etl_prefix_seconds"] + report["member_seconds"][0])
+
+# Unit Tests: src.pipeline.summarize_sweep_timings
+def test_summarize_sweep_timings_serial_baseline():
+    report = summarize_sweep_timings(prefix_seconds=10.0, member_seconds=[2.0, 3.0, 5.0], wall_seconds=15.0)
+
+    assert report["members"] == 3
+    # every member would have rerun the 10s ETL prefix when run serially
+    assert report["estimated_serial_seconds"] == pytest.approx(40.0)
+    assert report["estimated_speedup"] == pytest.approx(40.0 / 15.0)
+
+def test_summarize_sweep_timings_empty_sweep():
+    report = summarize_sweep_timings(prefix_seconds=0.0, member_seconds=[], wall_seconds=0.0)
+
+    assert report["estimated_serial_seconds"] == 0
+    assert report["estimated_speedup"] is None
+
+def test_summarize_sweep_timings_all_failed():
+    report = summarize_sweep_timings(prefix_seconds=10.0, member_seconds=[], wall_seconds=12.0, failed_members=2)
+
+    assert report["failed_members"] == 2
+    assert report["estimated_serial_seconds"] == 0
+    assert report["estimated_speedup"] is None